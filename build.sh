@@ -6,10 +6,10 @@ export PYTHONUSERBASE=/opt/render/project/src/.python
 mkdir -p $PYTHONUSERBASE
 
 echo "Installing Python dependencies..."
-pip3 install --user --no-cache-dir numpy pandas scipy
+pip3 install --user --no-cache-dir numpy pandas pyarrow
 
 echo "Verifying Python packages..."
-python3 -c "import numpy; import pandas; import scipy; print('Python packages OK')"
+python3 -c "import numpy; import pandas; import pyarrow; print('Python packages OK')"
 
 echo "Installing Node dependencies..."
 export NODE_ENV=development
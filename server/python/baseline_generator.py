@@ -1,9 +1,16 @@
 import os
 import json
-import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from pathlib import Path
 
+try:
+  import orjson
+except ImportError:  # optional, faster JSON parser
+  orjson = None
+
 BASELINE_DIR = Path("example_files/Baseline")
 OUTPUT_PATH = Path("server/data/baselines/new_good_baseline.json")
 
@@ -20,26 +27,63 @@ TOLERANCE = {
   "range_padding_cap_pct": 0.25
 }
 
-def compute_padding(p05, p95, param):
+# p05/p95 are arrays aligned with params; returns one padding per param
+def compute_padding(p05, p95, params):
   range_val = p95 - p05
-  min_pad = TOLERANCE["min_padding"].get(param, TOLERANCE["default_min_padding"])
-  pad = max(min_pad, range_val * TOLERANCE["range_padding_pct"])
-  pad = min(pad, range_val * TOLERANCE["range_padding_cap_pct"])
+  min_pad = np.array([TOLERANCE["min_padding"].get(param, TOLERANCE["default_min_padding"]) for param in params])
+  pad = np.maximum(min_pad, range_val * TOLERANCE["range_padding_pct"])
+  pad = np.minimum(pad, range_val * TOLERANCE["range_padding_cap_pct"])
   return pad
 
+# Header names as pandas.read_csv gave them: empty fields become "Unnamed: N" and
+# repeats become name.1, name.2, ... (skipping names already in the header)
+def dedupe_columns(names):
+  unnamed = [i for i, name in enumerate(names) if not name]
+  names = [name or f"Unnamed: {i}" for i, name in enumerate(names)]
+  counts = {}
+  # Named columns are renamed first, so given names win over generated ones
+  for i in [i for i in range(len(names)) if i not in unnamed] + unnamed:
+    col = names[i]
+    cur = counts.get(col, 0)
+    while cur > 0:
+      counts[names[i]] = cur + 1
+      col = f"{names[i]}.{cur}"
+      cur = cur + 1 if col in names else counts.get(col, 0)
+    names[i] = col
+    counts[col] = cur + 1
+  return names
+
 def load_csv(csv_path):
-  df = pd.read_csv(csv_path)
-  numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-  return {col: df[col].dropna().values for col in numeric_cols if len(df[col].dropna()) > 0}
+  # Runs inside the process pool, which already uses every core, so parse on one thread
+  table = pacsv.read_csv(csv_path, read_options=pacsv.ReadOptions(use_threads=False))
+  data = {}
+  for col, column in zip(dedupe_columns(table.column_names), table.columns):
+    if not (pa.types.is_floating(column.type) or pa.types.is_integer(column.type)):
+      continue
+    arr = column.to_numpy()  # nulls come back as NaN
+    arr = arr[~np.isnan(arr)]
+    if arr.size > 0:
+      data[col] = arr
+  return data
+
+def load_metadata(metadata_path):
+  if orjson is not None:
+    return orjson.loads(metadata_path.read_bytes())
+  with open(metadata_path, 'r') as f:
+    return json.load(f)
 
 def main():
   all_data = {}
   file_counts = {}
 
-  for metadata_path in BASELINE_DIR.rglob("*_metadata.json"):
-    with open(metadata_path, 'r') as f:
-      metadata = json.load(f)
+  # First pass: resolve which CSVs to load, keyed by (group, size, app)
+  jobs = []
+  metadata_paths = list(BASELINE_DIR.rglob("*_metadata.json"))
+  # Metadata reads are IO-bound, so threads overlap them despite the GIL
+  with ThreadPoolExecutor() as executor:
+    metadatas = list(executor.map(load_metadata, metadata_paths))
 
+  for metadata_path, metadata in zip(metadata_paths, metadatas):
     subdir = metadata_path.parent.name  # "PSI HD 22L"
     group, size = subdir.rsplit(' ', 1)  # split last space
 
@@ -54,10 +98,13 @@ def main():
         print(f"CSV not found: {csv_path}")
         continue
 
-      data = load_csv(csv_path)
       app = file_info.get('application', 'Power Systems')
+      jobs.append(((group, size, app), csv_path))
 
-      key = (group, size, app)
+  # CSVs are independent, so parse them in parallel; map() keeps job order
+  with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+    results = executor.map(load_csv, [csv_path for _, csv_path in jobs])
+    for (key, _), data in zip(jobs, results):
       if key not in all_data:
         all_data[key] = {}
         file_counts[key] = 0
@@ -66,7 +113,7 @@ def main():
       for param, vals in data.items():
         if param not in all_data[key]:
           all_data[key][param] = []
-        all_data[key][param].extend(vals)
+        all_data[key][param].append(vals)
 
   # Compute stats
   baseline = {
@@ -82,13 +129,24 @@ def main():
       baseline["groups"][group][size] = {}
     subgroup = baseline["groups"][group][size]
 
-    stats = {}
-    for param, vals in params_data.items():
-      if len(vals) < 10:
+    params = []
+    percentiles = []
+    for param, arrays in params_data.items():
+      # Per-file arrays are joined once here instead of growing a list of floats
+      vals_arr = np.concatenate(arrays).astype(np.float64, copy=False)
+      if vals_arr.size < 10:
         continue
-      p05 = np.percentile(vals, 5)
-      p95 = np.percentile(vals, 95)
-      pad = compute_padding(p05, p95, param)
+      # One call shares a single partition between both percentiles
+      params.append(param)
+      percentiles.append(np.percentile(vals_arr, [5, 95]))
+
+    # Pad the whole subgroup at once rather than param by param
+    percentiles = np.array(percentiles).reshape(-1, 2)
+    p05s, p95s = percentiles[:, 0], percentiles[:, 1]
+    pads = compute_padding(p05s, p95s, params)
+
+    stats = {}
+    for param, p05, p95, pad in zip(params, p05s, p95s, pads):
       stats[param] = {
         "p05_mean": p05,
         "p95_mean": p95,
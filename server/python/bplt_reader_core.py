@@ -5,14 +5,37 @@ Based on BPLTExporter by Tyler Onkst (tonkst@psiengines.com)
 Version-aware parser with support for legacy BPLT v1.1.0 headers and
 optional debug logging for troubleshooting conversions.
 """
+import csv
+import functools
+import io
+import mmap
 import os
+import re
 import struct
 from typing import TYPE_CHECKING, Tuple
 
 if TYPE_CHECKING:
     import pandas as pd
     import numpy as np
-    from scipy.interpolate import interp1d
+
+# Substrings that mark a header string as something other than a channel name.
+# 'Q#A' is covered by '#', and a leading '?' already fails the isalnum() check.
+_INVALID_CHANNEL_RE = re.compile(r'[@#/>]|\*EVENT\*')
+
+# Precompiled little-endian layouts; Struct skips re-parsing the format per call
+_U32 = struct.Struct('<I')
+_F64 = struct.Struct('<d')
+_COUNTS = struct.Struct('<IId')  # num_columns, num_rows, time_delta
+_PROPERTIES_PREAMBLE = struct.Struct('<IdBdI')  # count, double_1, integer_1, double_2, integer_2
+_PROPERTY_INTS = struct.Struct('<5I')
+_PROPERTY_DOUBLES = struct.Struct('<2d')
+_TRAILER = struct.Struct('<II')
+
+# Interpolated cells below which the numpy path beats Numba's import/JIT overhead
+NUMBA_MIN_CELLS = 1_000_000
+
+# Rows interpolated and written per block when streaming a conversion to CSV
+CHUNK_ROWS = 65536
 
 
 def _log(debug: bool, message: str) -> None:
@@ -37,47 +60,59 @@ def is_valid_channel_name(name: str) -> bool:
     if not name or len(name) < 2:
         return False
 
-    invalid_markers = ['@', '#', '*EVENT*', '/', '>', 'Q#A']
     return (name[0].isalnum() and
-            not any(marker in name for marker in invalid_markers) and
-            name.isprintable() and
-            not name.startswith('?'))
+            _INVALID_CHANNEL_RE.search(name) is None and
+            name.isprintable())
+
+
+def _map_file(file_handle, access: int = mmap.ACCESS_READ) -> mmap.mmap:
+    """Memory-map an open binary file; read-only unless another access mode is given."""
+    if os.fstat(file_handle.fileno()).st_size == 0:
+        raise ValueError("BPLT file is empty")
+    return mmap.mmap(file_handle.fileno(), 0, access=access)
 
 
-def read_until_null(file_handle) -> str:
-    """Read bytes from a file until a NULL character is encountered."""
-    result = bytearray()
-    while True:
-        byte = file_handle.read(1)
-        if byte == b'\x00' or not byte:  # NULL or EOF
-            break
-        result.extend(byte)
-    return result.decode('ascii', errors='ignore').strip()
+def _find_null(mm: mmap.mmap, start: int) -> int:
+    """Return the offset of the first NULL byte at or after start, or the map's end at EOF."""
+    end = mm.find(b'\x00', start)
+    return len(mm) if end < 0 else end
 
 
-def read_channel_name(file_handle, version: Tuple[int, int, int] | None = None) -> str:
+def read_until_null(mm: mmap.mmap) -> str:
+    """Read bytes from a memory-mapped file until a NULL character is encountered."""
+    start = mm.tell()
+    end = _find_null(mm, start)
+    mm.seek(min(end + 1, len(mm)))
+    return mm[start:end].decode('ascii', errors='ignore').strip()
+
+
+def read_channel_name(mm: mmap.mmap, version: Tuple[int, int, int] | None = None) -> str:
     """
-    Read a channel name from the file.
+    Read a channel name from a memory-mapped file.
 
     v1.1.0 uses single NULL termination; newer versions use double NULL.
     """
     is_version_1_1 = version and version[0] == 1 and version[1] == 1
 
-    if not is_version_1_1:
-        # Skip until the first NULL for double-terminated names
-        while True:
-            byte = file_handle.read(1)
-            if byte == b'\x00' or not byte:
-                break
+    if is_version_1_1:
+        name = read_until_null(mm)
+    else:
+        # Double-terminated: the name is the field after the first NULL. Locate
+        # both terminators up front and decode only the name bytes.
+        start = min(_find_null(mm, mm.tell()) + 1, len(mm))
+        end = _find_null(mm, start)
+        mm.seek(min(end + 1, len(mm)))
+        name = mm[start:end].decode('ascii', errors='ignore').strip()
 
-    name = read_until_null(file_handle)
     return "" if not name or name.upper() == "NULL" else name
 
 
-def read_plot_property_safe(file_handle, version: Tuple[int, int, int] | None = None) -> dict:
+def read_plot_property_safe(mm: mmap.mmap, version: Tuple[int, int, int] | None = None) -> tuple:
     """
     Read a single plot property entry with version-aware parsing.
 
+    Returns (string1, string2, integers, doubles).
+
     v1.1.0: one string + 5 ints + 2 doubles
     v4.1.0: two strings + 5 ints (no doubles)
     other versions: two strings + 5 ints + 2 doubles
@@ -92,51 +127,80 @@ def read_plot_property_safe(file_handle, version: Tuple[int, int, int] | None =
         if major == 1 and minor == 1:
             single_string = True
 
-    string1 = read_until_null(file_handle)
-    string2 = "" if single_string else read_until_null(file_handle)
+    string1 = read_until_null(mm)
+    string2 = "" if single_string else read_until_null(mm)
 
-    int_bytes = file_handle.read(20)  # 5 * 4 bytes
-    if len(int_bytes) < 20:
+    int_bytes = mm.read(_PROPERTY_INTS.size)
+    if len(int_bytes) < _PROPERTY_INTS.size:
         raise ValueError(f"Incomplete plot property integers: got {len(int_bytes)} bytes")
-    integers = struct.unpack('<IIIII', int_bytes)
+    integers = _PROPERTY_INTS.unpack(int_bytes)
 
     if skip_doubles:
         doubles = (0.0, 0.0)
     else:
-        double_bytes = file_handle.read(16)  # 2 * 8 bytes
-        doubles = struct.unpack('<dd', double_bytes) if len(double_bytes) >= 16 else (0.0, 0.0)
+        double_bytes = mm.read(_PROPERTY_DOUBLES.size)
+        doubles = _PROPERTY_DOUBLES.unpack(double_bytes) if len(double_bytes) >= _PROPERTY_DOUBLES.size else (0.0, 0.0)
+
+    return string1, string2, integers, doubles
+
+
+def read_marker(mm: mmap.mmap) -> tuple:
+    """Read a single marker entry as (double_value, string1, string2, string3)."""
+    double_value = _F64.unpack(mm.read(_F64.size))[0]
+    string1 = read_until_null(mm)
+    string2 = read_until_null(mm)
+    string3 = read_until_null(mm)
+
+    return double_value, string1, string2, string3
+
+
+def _new_plot_properties(count: int) -> dict:
+    """Allocate column storage for up to count plot properties."""
+    import numpy as np
 
     return {
-        'string1': string1,
-        'string2': string2,
-        'integers': integers,
-        'doubles': doubles
+        'string1': [],
+        'string2': [],
+        'integers': np.empty((count, 5), dtype=np.uint32),
+        'doubles': np.empty((count, 2), dtype=np.float64),
     }
 
 
-def read_marker(file_handle) -> dict:
-    """Read a single marker entry."""
-    double_value = struct.unpack('<d', file_handle.read(8))[0]
-    string1 = read_until_null(file_handle)
-    string2 = read_until_null(file_handle)
-    string3 = read_until_null(file_handle)
+def _new_markers(count: int) -> dict:
+    """Allocate column storage for up to count markers."""
+    import numpy as np
 
     return {
-        'double_value': double_value,
-        'string1': string1,
-        'string2': string2,
-        'string3': string3
+        'double_value': np.empty(count, dtype=np.float64),
+        'string1': [],
+        'string2': [],
+        'string3': [],
     }
 
 
 def read_header_from_handle(file_handle, debug: bool = False) -> dict:
-    """Read the BPLT file header information from an open file handle."""
-    file_identifier = read_until_null(file_handle)
+    """
+    Read the BPLT file header information from an open file handle.
+
+    The handle must be a real, non-empty file with a fileno() (not BytesIO),
+    since the header is parsed from a memory map; an empty file raises ValueError.
+    """
+    with _map_file(file_handle) as mm:
+        mm.seek(file_handle.tell())
+        header = _read_header_from_map(mm, debug=debug)
+    # Leave the handle positioned at the data section, as a sequential read would
+    file_handle.seek(header['header_position'])
+    return header
+
+
+def _read_header_from_map(mm: mmap.mmap, debug: bool = False) -> dict:
+    """Parse the header fields from a memory-mapped BPLT file."""
+    file_identifier = read_until_null(mm)
     _log(debug, f"File identifier: {file_identifier}")
     if not file_identifier.startswith("ECI Binary Plot Data File"):
         raise ValueError(f"Invalid file identifier: {file_identifier}")
 
-    version_string = read_until_null(file_handle)
+    version_string = read_until_null(mm)
     _log(debug, f"Version string: {version_string}")
     if not version_string.startswith("ECI Binary Plot File Version"):
         raise ValueError(f"Invalid version string: {version_string}")
@@ -144,24 +208,21 @@ def read_header_from_handle(file_handle, debug: bool = False) -> dict:
     version_tuple = parse_version(version_string)
     _log(debug, f"Parsed version: {version_tuple[0]}.{version_tuple[1]}.{version_tuple[2]}")
 
-    comments = read_until_null(file_handle)
+    comments = read_until_null(mm)
     _log(debug, f"Comments: {comments}")
 
-    counts = file_handle.read(8)  # 4 bytes each for two integers
+    counts = mm.read(_COUNTS.size)  # two uint32 counts then the float64 time delta
     if len(counts) < 8:
         raise ValueError(f"Incomplete counts data: got {len(counts)} bytes, expected 8")
-    num_columns, num_rows = struct.unpack('<II', counts)
+    if len(counts) < _COUNTS.size:
+        raise ValueError(f"Incomplete time delta data: got {len(counts) - 8} bytes")
+    num_columns, num_rows, time_delta = _COUNTS.unpack(counts)
     _log(debug, f"Columns: {num_columns}, Rows: {num_rows}")
-
-    time_delta_bytes = file_handle.read(8)
-    if len(time_delta_bytes) < 8:
-        raise ValueError(f"Incomplete time delta data: got {len(time_delta_bytes)} bytes")
-    time_delta = struct.unpack('<d', time_delta_bytes)[0]
     _log(debug, f"Time delta: {time_delta}")
 
     channel_names = []
     for _ in range(num_columns):
-        channel_name = read_channel_name(file_handle, version=version_tuple)
+        channel_name = read_channel_name(mm, version=version_tuple)
         if channel_name:
             channel_names.append(channel_name)
 
@@ -171,56 +232,65 @@ def read_header_from_handle(file_handle, debug: bool = False) -> dict:
     integer_1 = 0
     double_2 = 0.0
     integer_2 = 0
-    plot_properties = []
+    plot_properties = _new_plot_properties(0)
     num_markers = 0
-    markers = []
+    markers = _new_markers(0)
     final_integer_1 = 0
     final_integer_2 = 0
 
     try:
-        plot_props_count_bytes = file_handle.read(4)
-        if len(plot_props_count_bytes) >= 4:
-            plot_properties_count = struct.unpack('<I', plot_props_count_bytes)[0]
-
-            double1_bytes = file_handle.read(8)
-            if len(double1_bytes) >= 8:
-                double_1 = struct.unpack('<d', double1_bytes)[0]
-
-            int1_bytes = file_handle.read(1)
-            if len(int1_bytes) >= 1:
-                integer_1 = struct.unpack('<B', int1_bytes)[0]
-
-            double2_bytes = file_handle.read(8)
-            if len(double2_bytes) >= 8:
-                double_2 = struct.unpack('<d', double2_bytes)[0]
-
-            int2_bytes = file_handle.read(4)
-            if len(int2_bytes) >= 4:
-                integer_2 = struct.unpack('<I', int2_bytes)[0]
-
+        preamble = mm.read(_PROPERTIES_PREAMBLE.size)
+        if len(preamble) >= _U32.size:
+            if len(preamble) == _PROPERTIES_PREAMBLE.size:
+                plot_properties_count, double_1, integer_1, double_2, integer_2 = (
+                    _PROPERTIES_PREAMBLE.unpack(preamble)
+                )
+            else:
+                # Truncated file: only the count is trustworthy
+                plot_properties_count = _U32.unpack_from(preamble)[0]
+
+            # Counts come straight from the file, so never preallocate more
+            # records than the remaining bytes could hold
+            remaining = len(mm) - mm.tell()
+            plot_properties = _new_plot_properties(min(plot_properties_count, remaining // _PROPERTY_INTS.size))
+            read_count = 0
             for idx in range(plot_properties_count):
                 try:
-                    prop = read_plot_property_safe(file_handle, version=version_tuple)
-                    plot_properties.append(prop)
+                    string1, string2, integers, doubles = read_plot_property_safe(mm, version=version_tuple)
                 except Exception as exc:
                     _log(debug, f"Warning: Failed to read plot property {idx}: {exc}")
                     break
-
-            markers_count_bytes = file_handle.read(4)
-            if len(markers_count_bytes) >= 4:
-                num_markers = struct.unpack('<L', markers_count_bytes)[0]
-
+                plot_properties['string1'].append(string1)
+                plot_properties['string2'].append(string2)
+                plot_properties['integers'][idx] = integers
+                plot_properties['doubles'][idx] = doubles
+                read_count += 1
+            plot_properties['integers'] = plot_properties['integers'][:read_count]
+            plot_properties['doubles'] = plot_properties['doubles'][:read_count]
+
+            markers_count_bytes = mm.read(_U32.size)
+            if len(markers_count_bytes) >= _U32.size:
+                num_markers = _U32.unpack(markers_count_bytes)[0]
+
+                remaining = len(mm) - mm.tell()
+                markers = _new_markers(min(num_markers, remaining // _F64.size))
+                read_count = 0
                 for idx in range(num_markers):
                     try:
-                        marker = read_marker(file_handle)
-                        markers.append(marker)
+                        double_value, string1, string2, string3 = read_marker(mm)
                     except Exception as exc:
                         _log(debug, f"Warning: Failed to read marker {idx}: {exc}")
                         break
-
-                final_bytes = file_handle.read(8)
-                if len(final_bytes) >= 8:
-                    final_integer_1, final_integer_2 = struct.unpack('<LL', final_bytes)
+                    markers['double_value'][idx] = double_value
+                    markers['string1'].append(string1)
+                    markers['string2'].append(string2)
+                    markers['string3'].append(string3)
+                    read_count += 1
+                markers['double_value'] = markers['double_value'][:read_count]
+
+                final_bytes = mm.read(_TRAILER.size)
+                if len(final_bytes) >= _TRAILER.size:
+                    final_integer_1, final_integer_2 = _TRAILER.unpack(final_bytes)
     except Exception as exc:
         _log(debug, f"Warning: Some header fields could not be read: {exc}")
 
@@ -243,7 +313,7 @@ def read_header_from_handle(file_handle, debug: bool = False) -> dict:
         'markers': markers,
         'final_integer_1': final_integer_1,
         'final_integer_2': final_integer_2,
-        'header_position': file_handle.tell(),
+        'header_position': mm.tell(),
     }
 
 
@@ -254,44 +324,58 @@ def read_header(file_path: str, debug: bool = False) -> dict:
 
 
 def read_data(file_handle, channel_names: list, header_info: dict | None = None, debug: bool = False) -> dict:
-    """Read the data section of the BPLT file using numpy for efficiency."""
+    """
+    Read the data section of the BPLT file using numpy for efficiency.
+
+    Channel arrays are zero-copy views into a copy-on-write memory map of the
+    file: they can be edited in place, and edits are never written back to the
+    file. Each view holds a reference to the map, so it stays valid for as long
+    as the returned DataFrames (or arrays taken from them) are alive, even after
+    file_handle is closed.
+    """
     import numpy as np
     import pandas as pd
 
+    mm = _map_file(file_handle, access=mmap.ACCESS_COPY)
+    pos = file_handle.tell()
     channel_dfs = {}
     for channel_idx, channel_name in enumerate(channel_names):
         try:
-            count_bytes = file_handle.read(4)
-            if len(count_bytes) < 4:
+            if pos + _U32.size > len(mm):
                 _log(debug, f"Skipping channel {channel_name}: missing count bytes")
+                pos = len(mm)
                 continue
 
-            num_elements = struct.unpack('<L', count_bytes)[0]
+            num_elements = _U32.unpack_from(mm, pos)[0]
+            pos += _U32.size
             if num_elements == 0:
                 _log(debug, f"Skipping channel {channel_name}: zero elements")
                 continue
 
-            time_bytes = file_handle.read(8 * num_elements)
-            if len(time_bytes) < 8 * num_elements:
+            if pos + 8 * num_elements > len(mm):
                 _log(debug, f"Skipping channel {channel_name}: incomplete time data")
+                pos = len(mm)
                 continue
-            time_values = np.frombuffer(time_bytes, dtype='<f8', count=num_elements)
+            time_values = np.frombuffer(mm, dtype='<f8', count=num_elements, offset=pos)
+            pos += 8 * num_elements
 
-            data_bytes = file_handle.read(4 * num_elements)
-            if len(data_bytes) < 4 * num_elements:
+            if pos + 4 * num_elements > len(mm):
                 _log(debug, f"Skipping channel {channel_name}: incomplete value data")
+                pos = len(mm)
                 continue
-            data_values = np.frombuffer(data_bytes, dtype='<f4', count=num_elements)
+            data_values = np.frombuffer(mm, dtype='<f4', count=num_elements, offset=pos)
+            pos += 4 * num_elements
 
             df = pd.DataFrame({
                 'Time': time_values,
                 channel_name: data_values
-            })
+            }, copy=False)
             channel_dfs[channel_name] = df
         except Exception as exc:
             _log(debug, f"Warning: Error reading channel {channel_name}: {exc}")
             continue
 
+    file_handle.seek(pos)
     if not channel_dfs:
         raise Exception("No valid channels could be read from the file")
 
@@ -313,52 +397,209 @@ def read_bplt_file(file_path: str, debug: bool = False, header: dict | None = No
         }
 
 
-def upsample_and_combine_channels(channel_dfs: dict, debug: bool = False) -> 'pd.DataFrame':
-    """Upsample and combine all channels into a single DataFrame."""
+def _linear_interp(src_t: 'np.ndarray', src_y: 'np.ndarray', dst_t: 'np.ndarray', start: int = 0) -> 'np.ndarray':
+    """
+    Linearly interpolate float32 src_y (sampled at ascending src_t) onto dst_t as float32.
+
+    Points outside src_t are extrapolated; fewer than 2 samples yield NaN.
+    start may be any index up to searchsorted(src_t, dst_t.min()).
+    """
+    import numpy as np
+
+    if src_t.size < 2:
+        return np.full(dst_t.shape, np.nan, dtype=src_y.dtype)
+
+    idx = (np.searchsorted(src_t[start:], dst_t) + start).clip(1, src_t.size - 1)
+    t0 = src_t[idx - 1]
+    y0 = src_y[idx - 1]
+    dt = src_t[idx] - t0
+    frac = np.divide(dst_t - t0, dt, out=np.zeros_like(dt), where=dt != 0)
+    return y0 + (src_y[idx] - y0) * frac.astype(src_y.dtype)
+
+
+def _sorted_samples(src_t: 'np.ndarray', src_y: 'np.ndarray') -> Tuple['np.ndarray', 'np.ndarray']:
+    """Return a channel's samples ordered by time; already-ascending channels are returned as-is."""
+    import numpy as np
+
+    if src_t.size > 1 and not np.all(src_t[1:] >= src_t[:-1]):
+        # Stable, so samples with equal times keep file order
+        order = np.argsort(src_t, kind='stable')
+        return src_t[order], src_y[order]
+    return src_t, src_y
+
+
+@functools.lru_cache(maxsize=None)
+def _numba_interp_kernel():
+    """
+    Compile the multi-channel interpolation kernel, or return None if Numba is unusable.
+
+    The kernel fills float32 out[:, c] from src_times/src_vals[offsets[c]:offsets[c + 1]].
+    cursor[c] starts at offsets[c] + 1 and only moves forward across calls, so
+    every ref_t block must be ascending and continue the previous one.
+    """
+    try:
+        from numba import njit, prange
+    except Exception:
+        return None
+    import numpy as np
+
+    def interp_all(ref_t, src_times, src_vals, offsets, cursor, out):
+        for c in prange(offsets.size - 1):
+            start = offsets[c]
+            stop = offsets[c + 1]
+            if stop - start < 2:
+                for k in range(ref_t.size):
+                    out[k, c] = np.nan
+                continue
+
+            j = cursor[c]
+            for k in range(ref_t.size):
+                t = ref_t[k]
+                while j < stop - 1 and src_times[j] < t:
+                    j += 1
+                t0 = src_times[j - 1]
+                y0 = src_vals[j - 1]
+                dt = src_times[j] - t0
+                frac = np.float32((t - t0) / dt) if dt != 0 else np.float32(0.0)
+                out[k, c] = y0 + (src_vals[j] - y0) * frac
+            cursor[c] = j
+
+    try:
+        return njit(parallel=True, cache=True)(interp_all)
+    except Exception:
+        return None
+
+
+def iter_upsampled_chunks(channel_dfs: dict, chunk_rows: int = CHUNK_ROWS, debug: bool = False):
+    """
+    Upsample all channels onto the longest channel's time grid, one row block at a time.
+
+    Yields (time, columns) pairs: a float64 slice of the reference time grid and
+    a list of float32 arrays, one per channel in channel_dfs order. A reference
+    grid that steps backwards is still interpolated correctly, just more slowly.
+    """
     import numpy as np
-    import pandas as pd
-    from scipy.interpolate import interp1d
 
     max_samples = max(df.shape[0] for df in channel_dfs.values())
     ref_channel_name, ref_channel = max(channel_dfs.items(), key=lambda x: x[1].shape[0])
-    time_col = ref_channel['Time']
+    time_values = ref_channel['Time'].to_numpy()
+    _log(debug, f"Reference channel: {ref_channel_name} ({max_samples} samples)")
+    ascending = bool(np.all(time_values[1:] >= time_values[:-1]))
+    if not ascending:
+        _log(debug, "Reference time is not ascending; searching each block from the start")
 
-    channel_data = {}
+    # Per channel: its full-rate values, or its index among the interpolated columns
+    sources = []
+    to_interp = []
     for name, df in channel_dfs.items():
         if df.shape[0] < max_samples:
-            interpolator = interp1d(
-                df['Time'],
-                df[name],
-                kind='linear',
-                bounds_error=False,
-                fill_value='extrapolate'
-            )
-            channel_data[name] = interpolator(time_col)
+            sources.append(len(to_interp))
+            to_interp.append(name)
         else:
-            channel_data[name] = df[name].values
+            sources.append(df[name].to_numpy())
+    _log(debug, f"Interpolating {len(to_interp)} of {len(channel_dfs)} channels")
+
+    interp_sources = [
+        _sorted_samples(channel_dfs[name]['Time'].to_numpy(), channel_dfs[name][name].to_numpy())
+        for name in to_interp
+    ]
+    starts = [0] * len(to_interp)
+
+    # Importing Numba costs more than small files take to interpolate with numpy,
+    # and its forward-only walk is only valid on an ascending grid
+    interp_cells = len(to_interp) * max_samples
+    use_numba = ascending and interp_cells >= NUMBA_MIN_CELLS
+    interp_all = _numba_interp_kernel() if use_numba else None
+    if interp_all is not None:
+        # Pack the short channels into flat arrays so one parallel call covers them all
+        lengths = [src_t.size for src_t, _ in interp_sources]
+        offsets = np.zeros(len(to_interp) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        cursor = offsets[:-1] + 1
+        src_times = np.concatenate([src_t for src_t, _ in interp_sources])
+        src_vals = np.concatenate([src_y for _, src_y in interp_sources])
+
+    for lo in range(0, max_samples, chunk_rows):
+        hi = min(lo + chunk_rows, max_samples)
+        ref_t = time_values[lo:hi]
+
+        # Column-major so every interpolated column is contiguous for pandas and Arrow
+        out = np.empty((hi - lo, len(to_interp)), dtype=np.float32, order='F')
+        if interp_all is not None:
+            try:
+                interp_all(ref_t, src_times, src_vals, offsets, cursor, out)
+            except Exception as exc:
+                # Compilation happens on first call; any Numba failure drops to
+                # numpy, which redoes this block from each channel's start
+                _log(debug, f"Warning: Numba interpolation failed, using numpy: {exc}")
+                interp_all = None
+        if interp_all is None:
+            for i, (src_t, src_y) in enumerate(interp_sources):
+                out[:, i] = _linear_interp(src_t, src_y, ref_t, start=starts[i])
+                if ascending:
+                    starts[i] = int(np.searchsorted(src_t[starts[i]:], ref_t[-1])) + starts[i]
+
+        yield ref_t, [out[:, src] if isinstance(src, int) else src[lo:hi] for src in sources]
 
-    _log(debug, f"Reference channel: {ref_channel_name} ({max_samples} samples)")
-    dfs_to_concat = [pd.DataFrame({'Time': time_col})]
-    dfs_to_concat.extend(pd.DataFrame({name: data}) for name, data in channel_data.items())
-    return pd.concat(dfs_to_concat, axis=1)
+
+def upsample_and_combine_channels(channel_dfs: dict, debug: bool = False) -> 'pd.DataFrame':
+    """Upsample and combine all channels into a single DataFrame that owns its columns."""
+    import pandas as pd
+
+    max_samples = max(df.shape[0] for df in channel_dfs.values())
+    time_values, values = next(iter_upsampled_chunks(channel_dfs, chunk_rows=max_samples, debug=debug))
+    # Time and full-rate channels are views of channel_dfs; the constructor copies them
+    columns = {'Time': time_values}
+    columns.update(zip(channel_dfs, values))
+    return pd.DataFrame(columns)
+
+
+def write_csv_chunks(columns: list, chunks, output_path: str) -> None:
+    """
+    Stream (time, columns) row blocks from iter_upsampled_chunks to CSV.
+
+    Uses Arrow's columnar writer with a float64 Time column and float32
+    channels, so values print at their stored precision.
+
+    Arrow always quotes header names, which the frontend parser does not
+    accept, so the header row is written separately with pandas-style
+    minimal quoting. NaN values are written as empty fields, as to_csv does.
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    header = io.StringIO()
+    csv.writer(header, lineterminator='\n').writerow(columns)
+    schema = pa.schema([(columns[0], pa.float64())] + [(name, pa.float32()) for name in columns[1:]])
+    with open(output_path, 'wb') as f:
+        f.write(header.getvalue().encode('utf-8'))
+        options = pacsv.WriteOptions(include_header=False)
+        with pacsv.CSVWriter(f, schema, write_options=options) as writer:
+            for time_values, values in chunks:
+                arrays = [pa.array(time_values, from_pandas=True)]
+                arrays.extend(pa.array(column, from_pandas=True) for column in values)
+                writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
 
 
 def convert_bplt_to_csv(input_path: str, output_path: str, debug: bool = False) -> None:
     """Convert a BPLT file to CSV format."""
-    header = read_header(input_path, debug=debug)
-
-    max_cells = int(os.getenv("BPLT_MAX_CELLS", "5000000"))
-    num_columns = int(header.get("num_columns") or 0)
-    num_rows = int(header.get("num_rows") or 0)
-    estimated_cells = num_columns * num_rows if num_columns and num_rows else 0
-
-    if max_cells > 0 and estimated_cells > max_cells:
-        raise ValueError(
-            "BPLT file too large for server conversion. "
-            f"Estimated {num_rows} rows x {num_columns} columns ({estimated_cells:,} cells). "
-            "Convert locally or increase BPLT_MAX_CELLS."
-        )
-
-    bplt_data = read_bplt_file(input_path, debug=debug, header=header)
-    combined_df = upsample_and_combine_channels(bplt_data['data'], debug=debug)
-    combined_df.to_csv(output_path, index=False)
+    with open(input_path, 'rb') as f:
+        header = read_header_from_handle(f, debug=debug)
+
+        max_cells = int(os.getenv("BPLT_MAX_CELLS", "5000000"))
+        num_columns = int(header.get("num_columns") or 0)
+        num_rows = int(header.get("num_rows") or 0)
+        estimated_cells = num_columns * num_rows if num_columns and num_rows else 0
+
+        if max_cells > 0 and estimated_cells > max_cells:
+            raise ValueError(
+                "BPLT file too large for server conversion. "
+                f"Estimated {num_rows} rows x {num_columns} columns ({estimated_cells:,} cells). "
+                "Convert locally or increase BPLT_MAX_CELLS."
+            )
+
+        # The handle is already at the data section; no second open or seek needed
+        channel_dfs = read_data(f, header['channel_names'], header, debug=debug)
+
+    chunks = iter_upsampled_chunks(channel_dfs, debug=debug)
+    write_csv_chunks(['Time'] + list(channel_dfs), chunks, output_path)